@@ -1,15 +1,45 @@
 import random
-from typing import Tuple, List
+from collections import deque
+from typing import Tuple, List, Set
 import pygame
 from cell import Cell
 from sweeper_enums import SweeperFonts, SweeperColors
 
 pygame.font.init()
 
+REVEALED = 1
+'''state bit set on a cell the player has uncovered'''
+
+FLAGGED = 2
+'''state bit set on a cell the player has flagged'''
+
+
+class BoardSnapshot:
+    __slots__ = ("rows", "cascades")
+
+    def __init__(self, rows: Tuple[bytes, ...], cascades: int = 0):
+        """
+        An immutable picture of the player visible state of a :class:`GameBoard`.
+
+        Each row is a :class:`bytes` object holding one state byte per cell (see :data:`REVEALED`
+        and :data:`FLAGGED`). Rows that did not change between two snapshots are the very same
+        object, so a snapshot only costs memory for the rows a move actually touched.
+
+        :param rows: one packed state row per row of the cell matrix
+        :param cascades: the board's cascade count at the time of the snapshot
+        """
+
+        self.rows: Tuple[bytes, ...] = rows
+        '''packed cell state, one bytes object per row'''
+
+        self.cascades: int = cascades
+        '''the number of zero cells clicked up to this snapshot, restored along with the cells'''
+
 
 class GameBoard:
 
-    def __init__(self, cells_x: int, cells_y: int, bombs: int, cell_size: int):
+    def __init__(self, cells_x: int, cells_y: int, bombs: int, cell_size: int, seed: int | None = None,
+                 headless: bool = False):
         """
         This class represents a minesweeper game board.
 
@@ -28,6 +58,10 @@ class GameBoard:
               the number of mines on the board
           - *cell_size*  :class:`int`:
               the length of a single side of a cell, each mine is a square
+          - *seed*  :class:`int`:
+              the seed used to place the mines
+          - *cascades*  :class:`int`:
+              the number of zero cells clicked in the moves that are currently played, undo rewinds it
 
          ::
 
@@ -35,7 +69,17 @@ class GameBoard:
          =============
          - :method:`draw_board`\ (self, screen: :class:`pygame.Surface`)
          - :method:`zero_clicked`\ (self, current_cell::class:`Cell`)
-         - :method:`draw_board`\ (self, screen::class:`pygame.Surface`)
+         - :method:`open_cell`\ (self, current_cell::class:`Cell`)
+         - :method:`chord`\ (self, current_cell::class:`Cell`)
+         - :method:`reveal_all`\ (self)
+         - :method:`is_cleared`\ (self)
+         - :method:`reveal_cell`\ (self, current_cell::class:`Cell`)
+         - :method:`flag_cell`\ (self, current_cell::class:`Cell`)
+         - :method:`commit_move`\ (self)
+         - :method:`undo`\ (self)
+         - :method:`redo`\ (self)
+         - :method:`snapshot`\ (self)
+         - :method:`restore`\ (self, snapshot::class:`BoardSnapshot`)
 
 
         -----
@@ -48,6 +92,8 @@ class GameBoard:
         :param cells_y: the number of rows on the board
         :param bombs: the number of bombs on the board
         :param cell_size: the size of each side of a cell
+        :param seed: seed for placing the mines, a random one is chosen when omitted
+        :param headless: build cells without surfaces or click events, for running the rules without a display
         :returns: GameBoard
         """
 
@@ -63,6 +109,15 @@ class GameBoard:
         self.num_mines: int = bombs
         '''the total number of mines on the board'''
 
+        self.headless: bool = headless
+        '''True if the cells carry no surfaces, only game state'''
+
+        self.seed: int = seed if seed is not None else random.randrange(2 ** 32)
+        '''the seed used to place the mines, the same seed always gives the same board'''
+
+        self.cascades: int = 0
+        '''the number of zero cells clicked so far, each one opens an area of the board. Undo rewinds it.'''
+
         # 2-d list of Cells. Each cell has a unique event, clicked_event
         self.cell_matrix: List[List[Cell | None]] = [[None for _ in range(self.num_cells_x)]
                                                      for _ in range(self.num_cells_y)]
@@ -73,31 +128,35 @@ class GameBoard:
             for cell in row:
                 cell.get_adjacency(self.cell_matrix)
 
-    def _seed_mines(self):
-        rand = random.Random()
+        # rows touched since the last snapshot, only these get re-packed.
+        self._dirty_rows: Set[int] = set()
+        self._last_snapshot: BoardSnapshot | None = None
 
-        # track how many mines have been seeded
-        left_to_seed = self.num_mines
+        # undo history, the last entry is always the current state of the board.
+        self._history: List[BoardSnapshot] = [self.snapshot()]
+        self._redo_stack: List[BoardSnapshot] = []
+
+    def _seed_mines(self):
+        rand = random.Random(self.seed)
 
         # populate game board with Cells.
         for row in range(self.num_cells_y):
             for col in range(self.num_cells_x):
 
-                # cell creation
-                click_event = pygame.event.custom_type()
+                # cell creation, pygame only has a limited number of custom event types to hand out
+                click_event = None if self.headless else pygame.event.custom_type()
                 location: Tuple[int, int] = (row * self.cell_size, col * self.cell_size)
 
                 self.cell_matrix[row][col] = Cell(location,
                                                   click_event,
                                                   SweeperColors.CELL_NORMAL.value,
-                                                  0, self.cell_size)
+                                                  0, self.cell_size, self.headless)
 
-        # populate mines based on required number of mines
-        while left_to_seed > 0:
-            x = rand.randint(0, self.num_cells_x - 1)
-            y = rand.randint(0, self.num_cells_y - 1)
-            self.cell_matrix[y][x].value = -1
-            left_to_seed -= 1
+        # populate mines based on required number of mines, sampling without replacement so no
+        # two mines land on the same cell
+        for index in rand.sample(range(self.num_cells_x * self.num_cells_y), self.num_mines):
+            y, x = divmod(index, self.num_cells_x)
+            self.cell_matrix[y][x].value = Cell.MINE
 
     def reveal_mines(self, screen: pygame.Surface):
         """Show all the mines on the board
@@ -136,6 +195,7 @@ class GameBoard:
     def zero_clicked(self, current_cell: Cell):
         if current_cell.is_flagged:
             return
+        self.cascades += 1
         self._clear_visited()
         # get_adjacency populates this cells adjacency list and determines value.
         current_cell.get_adjacency(self.cell_matrix)
@@ -146,24 +206,246 @@ class GameBoard:
         self._search_for_zeros(neighbors)
 
     def _search_for_zeros(self, neighbors: List[Cell]):
-        if len(neighbors) > 0:
-            current = neighbors.pop(0)
-
-            # if we have found a zero, check all the neighbors
+        # breadth first, iterative so large open areas cannot exhaust the recursion limit.
+        # visited means expanded: a cell is only marked once it is taken off the queue.
+        pending = deque(neighbors)
+        while pending:
+            current = pending.popleft()
+            if current.visited or current.is_flagged or current.value == Cell.MINE:
+                continue
+            current.visited = True
+            self.reveal_cell(current)
+
+            # a zero opens all of its neighbors, they are expanded in turn
             if current.value == 0:
-                if not current.visited and not current.is_flagged:
-                    current.visited = True
-                    current.get_adjacency(self.cell_matrix)
-                    neighbors.extend(current.adjacent_list)
-                    current.render_revealed_cell()
-                    for cell in current.adjacent_list:
-                        cell.render_revealed_cell()
-                        cell.visited = True
-
-            return self._search_for_zeros(neighbors)
-        return
+                current.get_adjacency(self.cell_matrix)
+                pending.extend(cell for cell in current.adjacent_list if not cell.visited)
 
     def _clear_visited(self):
         for row in self.cell_matrix:
             for cell in row:
                 cell.visited = False
+
+    def open_cell(self, current_cell: Cell) -> bool:
+        """
+        Uncover a cell the way a left click does: zeros open their whole area, flagged and
+        already revealed cells are left alone.
+
+        :param current_cell: the cell the player clicked
+        :return: False if a mine was uncovered, otherwise True
+        """
+
+        if current_cell.is_flagged or current_cell.is_revealed:
+            return True
+        if current_cell.value == Cell.MINE:
+            self.reveal_cell(current_cell)
+            return False
+        if current_cell.value == 0:
+            self.zero_clicked(current_cell)
+        else:
+            self.reveal_cell(current_cell)
+        return True
+
+    def chord(self, current_cell: Cell) -> bool:
+        """
+        Open every unflagged neighbor of a revealed number once the player has placed as many
+        flags around it as the number says.
+
+        :param current_cell: the revealed number cell
+        :return: False if a wrongly placed flag let a mine be uncovered, otherwise True
+        """
+
+        if not current_cell.is_revealed or current_cell.value <= 0:
+            return True
+        current_cell.get_adjacency(self.cell_matrix)
+        neighbors = list(current_cell.adjacent_list)
+        if sum(cell.is_flagged for cell in neighbors) != current_cell.value:
+            return True
+
+        safe = True
+        for cell in neighbors:
+            safe = self.open_cell(cell) and safe
+        return safe
+
+    def reveal_all(self):
+        """
+        Uncover every cell that is not flagged, used to show the board once the game is over.
+
+        :return: None
+        """
+
+        for row in self.cell_matrix:
+            for cell in row:
+                if not cell.is_revealed:
+                    self.reveal_cell(cell)
+
+    def is_cleared(self) -> bool:
+        """
+        Check whether every cell that is not a mine has been revealed.
+
+        :return: True if the game is won
+        """
+
+        for row in self.cell_matrix:
+            for cell in row:
+                if cell.value != Cell.MINE and not cell.is_revealed:
+                    return False
+        return True
+
+    def reveal_cell(self, current_cell: Cell):
+        """
+        Uncover a single cell and remember that its row changed since the last snapshot.
+
+        :param current_cell: the cell to reveal
+        :return: None
+        """
+
+        current_cell.render_revealed_cell()
+        self._dirty_rows.add(self._row_of(current_cell))
+
+    def flag_cell(self, current_cell: Cell):
+        """
+        Toggle the flag on a cell and remember that its row changed since the last snapshot.
+        Revealed cells cannot be flagged.
+
+        :param current_cell: the cell to flag or un-flag
+        :return: None
+        """
+
+        if current_cell.is_revealed:
+            return
+        current_cell.flagged()
+        self._dirty_rows.add(self._row_of(current_cell))
+
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Capture the current revealed/flagged state of the board.
+
+        Only rows changed since the previous snapshot are packed again, every other row is shared
+        with the previous snapshot.
+
+        :return: an immutable :class:`BoardSnapshot`
+        """
+
+        previous = self._last_snapshot
+        if previous is not None and not self._dirty_rows and previous.cascades == self.cascades:
+            return previous
+
+        rows = []
+        for row in range(self.num_cells_y):
+            if previous is None or row in self._dirty_rows:
+                rows.append(bytes(_cell_state(cell) for cell in self.cell_matrix[row]))
+            else:
+                rows.append(previous.rows[row])
+
+        self._dirty_rows.clear()
+        self._last_snapshot = BoardSnapshot(tuple(rows), self.cascades)
+        return self._last_snapshot
+
+    def commit_move(self):
+        """
+        Record the current state of the board as one step in the undo history.
+        Committing a move discards anything that could have been redone.
+
+        :return: None
+        """
+
+        current = self.snapshot()
+        if current is self._history[-1]:
+            return
+        self._history.append(current)
+        self._redo_stack.clear()
+
+    def undo(self) -> bool:
+        """
+        Step the board back to the previously committed move.
+
+        :return: True if a move was undone, False if there was nothing to undo
+        """
+
+        self.commit_move()
+        if len(self._history) < 2:
+            return False
+        self._redo_stack.append(self._history.pop())
+        self._apply_snapshot(self._history[-1])
+        return True
+
+    def redo(self) -> bool:
+        """
+        Re-apply the last undone move.
+
+        :return: True if a move was redone, False if there was nothing to redo
+        """
+
+        self.commit_move()
+        if not self._redo_stack:
+            return False
+        target = self._redo_stack.pop()
+        self._history.append(target)
+        self._apply_snapshot(target)
+        return True
+
+    def restore(self, snapshot: BoardSnapshot):
+        """
+        Return the board to a snapshot taken earlier, for instance after exploring a "what if" line in
+        practice mode. The restore itself is recorded as a move, so it can be undone.
+
+        :param snapshot: a snapshot previously returned by :method:`snapshot` on this board
+        :return: None
+        """
+
+        if (len(snapshot.rows) != self.num_cells_y
+                or any(len(row) != self.num_cells_x for row in snapshot.rows)):
+            raise ValueError("snapshot does not belong to a board of this size")
+        self.commit_move()
+        self._apply_snapshot(snapshot)
+        self._history.append(snapshot)
+        self._redo_stack.clear()
+
+    def _apply_snapshot(self, target: BoardSnapshot):
+        for row, col, new_state in changed_cells(self.snapshot(), target):
+            cell = self.cell_matrix[row][col]
+            cell.is_flagged = bool(new_state & FLAGGED)
+            if new_state & REVEALED and not cell.is_flagged:
+                cell.render_revealed_cell()
+            else:
+                cell.render_hidden_cell()
+            cell.is_revealed = bool(new_state & REVEALED)
+
+        # the board now matches the target exactly, so it can serve as the base for the next snapshot.
+        self.cascades = target.cascades
+        self._dirty_rows.clear()
+        self._last_snapshot = target
+
+    def _row_of(self, current_cell: Cell) -> int:
+        # cells are stored as cell_matrix[location[0] // size][location[1] // size]
+        return current_cell.location[0] // self.cell_size
+
+
+def changed_cells(before: BoardSnapshot, after: BoardSnapshot) -> List[Tuple[int, int, int]]:
+    """
+    List the cells whose state differs between two snapshots of the same board.
+    Rows shared by both snapshots are skipped without looking at their cells.
+
+    :param before: the older snapshot
+    :param after: the newer snapshot
+    :return: (row, col, new state) for every changed cell
+    """
+
+    changed = []
+    for row, (before_row, after_row) in enumerate(zip(before.rows, after.rows)):
+        if before_row is after_row or before_row == after_row:
+            continue
+        for col, (old_state, new_state) in enumerate(zip(before_row, after_row)):
+            if old_state != new_state:
+                changed.append((row, col, new_state))
+    return changed
+
+
+def _cell_state(current_cell: Cell) -> int:
+    state = 0
+    if current_cell.is_revealed:
+        state |= REVEALED
+    if current_cell.is_flagged:
+        state |= FLAGGED
+    return state
@@ -1,15 +1,29 @@
+from functools import lru_cache
 from typing import Tuple, List
 import pygame
-from sweeper_enums import SweeperFonts, SweeperColors
+from sweeper_enums import SweeperColors
+
+MINE_IMAGE = "images/mine.png"
+
+MINE_SCALE = 0.75
+'''the mine sprite's share of the side of a cell'''
+
+TEXT_SCALE = 0.45
+'''the font size of the numbers as a share of the side of a cell'''
+
+MIN_TEXT_SIZE = 6
+'''numbers are left off cells too small to fit a legible font'''
 
 
 class Cell:
     MINE = -1
 
-    def __init__(self, location: Tuple[int, int], click_event: int, color: str, value: int = 0, size: int = 10):
+    def __init__(self, location: Tuple[int, int], click_event: int | None, color: str, value: int = 0,
+                 size: int = 10, headless: bool = False):
         """
         A cell on the game-board.
 
+        :param headless: when True the cell keeps only its game state and never creates a surface.
         """
 
         self.value: int = value
@@ -27,17 +41,23 @@ class Cell:
         self.visited = False
         '''used while traversing the graph-like structored gameboard for zeros'''
 
+        self.is_revealed: bool = False
+        '''True once this cell has been uncovered by the player'''
+
         self._click_event = click_event
         '''Custom :class:`pygame.event.Event` triggered when this cell is clicked.'''
 
         self.color: str = color
         '''the current color of the cell'''
 
-        self.cell_surface = pygame.Surface((size, size))
-        '''the surface of the cell in which the cell image is printed'''
+        self.cell_surface: pygame.Surface | None = None
+        '''the surface of the cell in which the cell image is printed, None for headless cells'''
 
         self.adjacent_list: List[Cell] = []
 
+        if headless:
+            return
+        self.cell_surface = pygame.Surface((size, size))
         self.cell_surface.fill(self.color)
         pygame.draw.rect(self.cell_surface,
                          SweeperColors.CELL_BORDER.value,
@@ -73,30 +93,48 @@ class Cell:
                 pygame.event.post(cell_event)
 
     def flagged(self):
+        self.is_flagged = not self.is_flagged
+        if self.cell_surface is None:
+            return
         if self.is_flagged:
-            self.is_flagged = False
-            self.cell_surface.fill(SweeperColors.CELL_NORMAL.value)
-        else:
-            self.is_flagged = True
             self.cell_surface.fill(SweeperColors.CELL_FLAGGED.value)
+        else:
+            self.cell_surface.fill(SweeperColors.CELL_NORMAL.value)
 
     def render_revealed_cell(self):
         if self.is_flagged:
             return
-        writer = SweeperFonts.ARIAL_18.value
+        self.is_revealed = True
+        if self.cell_surface is None:
+            return
+        writer = scaled_font(self.size)
         clicked_color = SweeperColors.CELL_CLICKED.value
         font_color = SweeperColors.CELL_TEXT.value
         mine_color = SweeperColors.BOMB_BG.value
-        bomb = pygame.image.load_extended("images/mine.png")
 
         if self.value == Cell.MINE:
             self.cell_surface.fill(mine_color)
-            bomb = pygame.transform.scale(bomb, (30, 30))
+            bomb = scaled_mine(self.size)
             self.cell_surface.blit(bomb, get_center(bomb, self.cell_surface))
         else:
             self.cell_surface.fill(clicked_color)
-            rendered_text = writer.render(f"{self.value}", True, font_color)
-            self.cell_surface.blit(rendered_text, get_center(rendered_text, self.cell_surface))
+            if writer is not None:
+                rendered_text = writer.render(f"{self.value}", True, font_color)
+                self.cell_surface.blit(rendered_text, get_center(rendered_text, self.cell_surface))
+
+    def render_hidden_cell(self):
+        """Paint this cell as covered, either flagged or in its normal color."""
+
+        self.is_revealed = False
+        if self.cell_surface is None:
+            return
+        if self.is_flagged:
+            self.cell_surface.fill(SweeperColors.CELL_FLAGGED.value)
+        else:
+            self.cell_surface.fill(SweeperColors.CELL_NORMAL.value)
+            pygame.draw.rect(self.cell_surface,
+                             SweeperColors.CELL_BORDER.value,
+                             self.cell_surface.get_rect(), 1)
 
     def get_adjacency(self, board_matrix):
         """find all the surrounding cells to this cell and add them to this cells adjacency list.
@@ -120,14 +158,14 @@ class Cell:
         rows = [this_y - 1, this_y, this_y + 1]
         cols = [this_x - 1, this_x, this_x + 1]
 
-        # only check existing rows and columns
+        # only check existing rows and columns, rows index the inner lists and cols the outer list
         if rows[0] < 0:
             rows = rows[1:]
-        elif rows[-1] >= len(board_matrix):
+        if rows[-1] >= len(board_matrix[0]):
             rows = rows[:-1]
         if cols[0] < 0:
             cols = cols[1:]
-        elif cols[-1] >= len(board_matrix[0]):
+        if cols[-1] >= len(board_matrix):
             cols = cols[:-1]
 
         # check all the neighboring cells of this cell
@@ -144,6 +182,40 @@ class Cell:
         self.value = adjacent_mines
 
 
+@lru_cache(maxsize=1)
+def _mine_source() -> pygame.Surface:
+    return pygame.image.load_extended(MINE_IMAGE)
+
+
+@lru_cache(maxsize=2)
+def scaled_mine(cell_size: int) -> pygame.Surface:
+    """
+    The mine sprite sized for a cell. The image is read from disk once, and only the scaled copies
+    for the two most recent cell sizes are kept.
+
+    :param cell_size: the length of the side of a cell
+    :return: the scaled sprite
+    """
+
+    side = max(1, int(cell_size * MINE_SCALE))
+    return pygame.transform.scale(_mine_source(), (side, side))
+
+
+@lru_cache(maxsize=2)
+def scaled_font(cell_size: int) -> pygame.font.Font | None:
+    """
+    The font for the numbers on a cell, kept for the two most recent cell sizes.
+
+    :param cell_size: the length of the side of a cell
+    :return: the font, or None if the cell is too small for legible numbers
+    """
+
+    font_size = int(cell_size * TEXT_SCALE)
+    if font_size < MIN_TEXT_SIZE:
+        return None
+    return pygame.font.Font(pygame.font.match_font("ArialRounded"), font_size)
+
+
 def get_center(from_surface, to_surface):
     return ((to_surface.get_width() // 2) - (from_surface.get_width() // 2),
             (to_surface.get_height() // 2) - (from_surface.get_height() // 2))
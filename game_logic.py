@@ -0,0 +1,114 @@
+import queue
+import threading
+from typing import NamedTuple, Tuple
+
+from board import BoardSnapshot, GameBoard
+
+
+class Frame(NamedTuple):
+    """An immutable view of the game handed from the logic thread to the renderer."""
+
+    serial: int
+    '''increases by one for every published frame'''
+
+    snapshot: BoardSnapshot
+    '''revealed/flagged state of every cell'''
+
+    values: Tuple[Tuple[int, ...], ...]
+    '''the value of every cell, shared by all frames of a game'''
+
+    over: bool
+    '''True once a mine was hit or the board was cleared'''
+
+    won: bool
+    '''True if the game ended with the board cleared'''
+
+
+class GameLogic(threading.Thread):
+
+    def __init__(self, game_board: GameBoard):
+        """
+        Runs the rules of the game on its own thread.
+
+        Input is handed over with :method:`submit` and never waits for a move to finish, so a large
+        cascade cannot hold up event handling. After every move the thread publishes a new
+        :class:`Frame` by replacing :attr:`frame`. The assignment of a single reference is atomic, so
+        readers simply take whatever frame is current without any locking. Unchanged rows are shared
+        between consecutive frames, and :func:`board.changed_cells` turns any two frames into the
+        list of cells that need redrawing.
+
+        Commands:
+         =============
+         - ``("reveal", row, col)``
+         - ``("flag", row, col)``
+         - ``("undo",)``
+         - ``("redo",)``
+
+        :param game_board: the board to play on, it should be headless since it is only touched here
+        """
+
+        super().__init__(name="game-logic", daemon=True)
+
+        self.game_board = game_board
+        '''the board, owned by the logic thread once started'''
+
+        self._commands: queue.Queue[tuple | None] = queue.Queue()
+        self._values = tuple(tuple(cell.value for cell in row) for row in game_board.cell_matrix)
+
+        self.frame: Frame = Frame(0, game_board.snapshot(), self._values, False, False)
+        '''the most recently published frame'''
+
+    def submit(self, *command):
+        """
+        Queue a command for the logic thread. Never blocks.
+
+        :param command: the command name followed by its arguments
+        :return: None
+        """
+
+        self._commands.put_nowait(command)
+
+    def stop(self):
+        """
+        Ask the logic thread to finish once it has handled every queued command.
+
+        :return: None
+        """
+
+        self._commands.put(None)
+
+    def run(self):
+        while (command := self._commands.get()) is not None:
+            if self.frame.over:
+                continue
+            name, *args = command
+            safe = True
+            match name:
+                case "reveal" if self._on_board(*args):
+                    safe = self.game_board.open_cell(self._cell_at(*args))
+                    self.game_board.commit_move()
+                case "flag" if self._on_board(*args):
+                    self.game_board.flag_cell(self._cell_at(*args))
+                    self.game_board.commit_move()
+                case "undo":
+                    self.game_board.undo()
+                case "redo":
+                    self.game_board.redo()
+
+            won = safe and self.game_board.is_cleared()
+            if not safe or won:
+                self.game_board.reveal_all()
+            self._publish(over=not safe or won, won=won)
+
+    def _on_board(self, row: int, col: int) -> bool:
+        # clicks on the window outside the board, e.g. after a resize, are ignored
+        return 0 <= row < self.game_board.num_cells_y and 0 <= col < self.game_board.num_cells_x
+
+    def _cell_at(self, row: int, col: int):
+        return self.game_board.cell_matrix[row][col]
+
+    def _publish(self, over: bool, won: bool):
+        snapshot = self.game_board.snapshot()
+        if snapshot is self.frame.snapshot and not over:
+            return
+        self.frame = Frame(self.frame.serial + 1, snapshot, self._values, over, won)
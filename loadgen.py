@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+import server
+
+# ================
+# region Settings
+
+BOARD_SIZE = 15
+MINES = int((BOARD_SIZE ** 2) * 0.2)
+
+# endregion
+# ================
+
+
+async def _player(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  deadline: float, rand: random.Random, latencies: List[float]):
+    """play random games back to back until the deadline, timing every request"""
+
+    request_id = 0
+
+    async def _send(request: dict) -> dict:
+        nonlocal request_id
+        request_id += 1
+        request["id"] = request_id
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - started)
+        return response
+
+    status = "over"
+    while time.monotonic() < deadline:
+        if status != "playing":
+            status = (await _send({"op": "new", "width": BOARD_SIZE, "height": BOARD_SIZE,
+                                   "mines": MINES}))["status"]
+            continue
+        op = rand.choices(("reveal", "flag", "chord"), (8, 1, 1))[0]
+        response = await _send({"op": op,
+                                "row": rand.randrange(BOARD_SIZE),
+                                "col": rand.randrange(BOARD_SIZE)})
+        status = response.get("status", status)
+
+
+async def run(clients: int, seconds: float, host: str, port: int, unix_path: str | None):
+    """
+    Drive the server with concurrent simulated players and print throughput and latency.
+
+    :param clients: the number of concurrent connections
+    :param seconds: how long to generate load for
+    :param host: the server's TCP address
+    :param port: the server's TCP port
+    :param unix_path: connect through this Unix socket instead of TCP
+    """
+
+    connections = []
+    for _ in range(clients):
+        if unix_path:
+            connections.append(await asyncio.open_unix_connection(unix_path))
+        else:
+            connections.append(await asyncio.open_connection(host, port))
+
+    latencies: List[float] = []
+    started = time.monotonic()
+    deadline = started + seconds
+    await asyncio.gather(*(_player(reader, writer, deadline, random.Random(number), latencies)
+                           for number, (reader, writer) in enumerate(connections)))
+    elapsed = time.monotonic() - started
+
+    for _, writer in connections:
+        writer.close()
+
+    if not latencies:
+        print("no requests completed")
+        return
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{len(latencies)} requests from {clients} clients in {elapsed:.1f}s")
+    print(f"{len(latencies) / elapsed:.0f} requests/sec, p50 {p50 * 1000:.2f}ms, p99 {p99 * 1000:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bombsweeper server load generator")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--host", default=server.HOST)
+    parser.add_argument("--port", type=int, default=server.PORT)
+    parser.add_argument("--unix", help="path of the server's Unix socket")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.seconds, args.host, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
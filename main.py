@@ -1,9 +1,13 @@
+from datetime import datetime
 from typing import Tuple, List
 from pygame import time
 
 import board
 import cell
 import pygame
+import stats
+from game_logic import GameLogic
+from renderer import BoardRenderer, fit_cell_size
 from sweeper_enums import SweeperColors, SweeperFonts
 
 pygame.init()
@@ -12,8 +16,11 @@ pygame.font.init()
 # ================
 # region Settings
 
-CELL_SIZE = 40
-'''the length of the side of a cell. area = CELL_SIZE ** 2'''
+DISPLAY_FILL = 0.9
+'''the share of the desktop the game window may take up, the cell size is derived from it'''
+
+SCROLL_STEP = 5
+'''cells the view moves per arrow key press or wheel notch on boards larger than the window'''
 
 BOARD_SIZE_EASY = 8
 BOARD_SIZE_MED = 15
@@ -23,11 +30,18 @@ BOMBS_EASY = int((BOARD_SIZE_EASY ** 2) * 0.1)
 BOMBS_MED = int((BOARD_SIZE_MED ** 2) * 0.2)
 BOMBS_HARD = int((BOARD_SIZE_HARD ** 2) * 0.2)
 
+INPUT_RATE = 240
+'''how many times per second input events are polled and the latest frame is drawn'''
+
+STATS_PATH = "bombsweeper_stats.db"
+'''the SQLite file every finished game is recorded in'''
+
 # don't change these
 EASY = 0
 MED = 1
 HARD = 2
 CLOCK = pygame.time.Clock()
+STATS = stats.StatsStore(STATS_PATH)
 
 # endregion
 # ================
@@ -158,32 +172,21 @@ def difficulty_clicked(mouse_location: Tuple[int, int], choices: Tuple[pygame.Re
     return -1
 
 
-def cell_clicks(event: pygame.event.Event, mine_field: board.GameBoard, window: pygame.Surface):
+def cell_clicks(event: pygame.event.Event, logic: GameLogic, renderer: BoardRenderer):
     """
-    handle a click event inside a :class:`board.Cell`.
+    handle a click event inside a :class:`board.Cell` by handing it to the logic thread.
 
-    :param window: the main game board
     :param event: the click event that triggered this method.
-    :param mine_field: the current game board
-    :return: None
+    :param logic: the thread running the current game
+    :param renderer: maps the click through the current scale and viewport
+    :return: True if the click landed on the board
     """
 
-    cell_index_x = event.pos[0] // CELL_SIZE
-    cell_index_y = event.pos[1] // CELL_SIZE
-    current_cell = mine_field.cell_matrix[cell_index_x][cell_index_y]
-    if current_cell.is_flagged:
-        return True
-    current_cell.update(event)
-    if current_cell.value > 0:
-        # draw_cell_number(current_cell, window, current_cell.value)
-        current_cell.render_revealed_cell()
-        pygame.display.flip()
-        return True
-    elif current_cell.value == 0:
-        mine_field.zero_clicked(current_cell)
-        return True
-    else:
+    clicked = renderer.cell_at(event.pos)
+    if clicked is None:
         return False
+    logic.submit("reveal", *clicked)
+    return True
 
 
 def draw_cell_number(clicked, screen: pygame.Surface, number: int):
@@ -320,12 +323,47 @@ def again_clicked(click_position: Tuple[int, int], button_rects: List[pygame.rec
     return False, False
 
 
-def flag_cell(clicked_coords: Tuple[int, int], gboard: board.GameBoard):
-    x_index = int(clicked_coords[0] // CELL_SIZE)
-    y_index = int(clicked_coords[1] // CELL_SIZE)
+def flag_cell(clicked_coords: Tuple[int, int], logic: GameLogic, renderer: BoardRenderer):
+    clicked = renderer.cell_at(clicked_coords)
+    if clicked is None:
+        return False
+    logic.submit("flag", *clicked)
+    return True
+
 
-    current_cell = gboard.cell_matrix[x_index][y_index]
-    current_cell.flagged()
+def history_keys(event: pygame.event.Event, logic: GameLogic):
+    """
+    handle the undo (ctrl+z) and redo (ctrl+y) shortcuts.
+
+    :param event: the key press that triggered this method.
+    :param logic: the thread running the current game
+    :return: None
+    """
+
+    if not event.mod & pygame.KMOD_CTRL:
+        return
+    if event.key == pygame.K_z:
+        logic.submit("undo")
+    elif event.key == pygame.K_y:
+        logic.submit("redo")
+
+
+def scroll_view(event: pygame.event.Event, renderer: BoardRenderer):
+    """
+    move the viewport over boards that do not fit in the window, with the arrow keys or the mouse wheel.
+
+    :param event: the key press or wheel event that triggered this method.
+    :param renderer: the renderer owning the viewport
+    :return: True if the viewport moved
+    """
+
+    if event.type == pygame.MOUSEWHEEL:
+        return renderer.scroll(event.x * SCROLL_STEP, -event.y * SCROLL_STEP)
+    steps = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+    if event.key not in steps:
+        return False
+    step_x, step_y = steps[event.key]
+    return renderer.scroll(step_x * SCROLL_STEP, step_y * SCROLL_STEP)
 
 
 def main():
@@ -353,46 +391,76 @@ def main():
             num_mines = int((40 ** 2) * .35)
             board_x = board_y = 40
 
-    screen_size = (board_x * CELL_SIZE, board_y * CELL_SIZE)
-    game_board = board.GameBoard(board_x, board_y, num_mines, CELL_SIZE)
-    screen = pygame.display.set_mode(screen_size, 0, 32)
+    # scale the cells so the whole board fits on the desktop
+    desktop_w, desktop_h = pygame.display.get_desktop_sizes()[0]
+    available = (int(desktop_w * DISPLAY_FILL), int(desktop_h * DISPLAY_FILL))
+    cell_size = fit_cell_size(board_x, board_y, available)
 
-    running = True
+    # boards too large to fit even at the smallest cell size get a window-sized viewport
+    screen_size = (min(board_x * cell_size, available[0]), min(board_y * cell_size, available[1]))
+    pygame.display.set_mode(screen_size, pygame.RESIZABLE, 32)
 
-    # holds the pygame custom event type associated with the cell
-    cell_list = []
+    # the board only holds game state, this thread draws the frames published by the logic thread.
+    game_board = board.GameBoard(board_x, board_y, num_mines, 1, headless=True)
+    logic = GameLogic(game_board)
+    renderer = BoardRenderer(cell_size)
+    drawn_serial = -1
+    logic.start()
 
-    # populating the custom event list
-    for row in range(game_board.num_cells_y):
-        for col in range(game_board.num_cells_x):
-            cell_list.append(game_board.cell_matrix[row][col])
+    clicks = 0
+    start_ticks = time.get_ticks()
 
     # =====================
     #     main game loop
     # =====================
 
-    while running:
-        game_board.draw_board(screen)
-        events = pygame.event.get()
-        mouse_butts = pygame.mouse.get_pressed(3)
-        clicked_coords = pygame.mouse.get_pos()
-        for event in events:
+    # all SDL calls stay on this thread. Moves run on the logic thread, so a large cascade cannot
+    # hold up input, and drawing only blits the cells that changed since the last drawn frame.
+    while True:
+        for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                logic.stop()
                 pygame.quit()
-                return running
+                return False
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if mouse_butts[0]:
-                    running = cell_clicks(event, game_board, screen)
-                elif mouse_butts[2]:
-                    flag_cell(clicked_coords, game_board)
-
-        pygame.display.flip()
-        screen.fill("#aaaaaa")
-        CLOCK.tick(60)
-
-    game_board.reveal_mines(screen)
-    pygame.display.flip()
+                # only left and right clicks on the board count, not the wheel or the window margin
+                if event.button == pygame.BUTTON_LEFT:
+                    clicks += cell_clicks(event, logic, renderer)
+                elif event.button == pygame.BUTTON_RIGHT:
+                    clicks += flag_cell(event.pos, logic, renderer)
+            if event.type == pygame.KEYDOWN:
+                history_keys(event, logic)
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEWHEEL) and scroll_view(event, renderer):
+                drawn_serial = -1
+            if event.type == pygame.VIDEORESIZE:
+                # the window contents are lost on resize, draw everything again at the new scale
+                renderer.set_cell_size(fit_cell_size(board_x, board_y, (event.w, event.h)))
+                renderer.invalidate()
+                drawn_serial = -1
+
+        frame = logic.frame
+        if frame.serial != drawn_serial:
+            renderer.draw(pygame.display.get_surface(), frame)
+            pygame.display.flip()
+            drawn_serial = frame.serial
+        if frame.over:
+            break
+
+        CLOCK.tick(INPUT_RATE)
+
+    logic.stop()
+    logic.join()
+
+    # hand the finished game to the stats writer, this never waits on the disk.
+    STATS.record(stats.GameRecord(difficulty=difficulty,
+                                  seed=game_board.seed,
+                                  duration=(time.get_ticks() - start_ticks) / 1000,
+                                  clicks=clicks,
+                                  cascades=game_board.cascades,
+                                  won=logic.frame.won,
+                                  finished_at=datetime.now().timestamp()))
+
+    # the final frame has every cell revealed, leave it on screen for a moment.
     time.wait(5000)
     pygame.display.quit()
     if play_again():
@@ -402,4 +470,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        STATS.close()
@@ -0,0 +1,194 @@
+from typing import Dict, Tuple
+
+import pygame
+
+import board
+from board import BoardSnapshot
+from cell import Cell, get_center, scaled_font, scaled_mine
+from game_logic import Frame
+from sweeper_enums import SweeperColors
+
+# ================
+# region Settings
+
+MIN_CELL_SIZE = 4
+'''the smallest side of a cell in pixels, boards that do not fit at this size are scrolled instead'''
+
+MAX_CELL_SIZE = 40
+'''the largest side of a cell in pixels, small boards are not blown up past this'''
+
+# endregion
+# ================
+
+
+def fit_cell_size(cells_x: int, cells_y: int, available: Tuple[int, int]) -> int:
+    """
+    The largest cell size that fits a board into the available space. Boards too large to fit even
+    at :data:`MIN_CELL_SIZE` get that size and are shown through a scrolling viewport.
+
+    :param cells_x: the number of cells across the screen
+    :param cells_y: the number of cells down the screen
+    :param available: the width and height in pixels the board may use
+    :return: the side of a cell, between :data:`MIN_CELL_SIZE` and :data:`MAX_CELL_SIZE`
+    """
+
+    fitting = min(available[0] // cells_x, available[1] // cells_y)
+    return max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, fitting))
+
+
+class BoardRenderer:
+
+    def __init__(self, cell_size: int):
+        """
+        Draws :class:`game_logic.Frame` objects onto a surface.
+
+        Every distinct look a cell can have is rendered once into a tile and reused. Tiles are built
+        lazily for the current cell size and thrown away when it changes, the mine sprite and font
+        come from :func:`cell.scaled_mine` and :func:`cell.scaled_font`, which keep only the latest
+        scales. Memory follows the scale on screen rather than the size of the board.
+        Boards larger than the window are shown through a viewport: only the visible cells are ever
+        looked at or blitted, and only those that changed since the last drawn frame.
+
+        :param cell_size: the length of the side of a cell on screen
+        """
+
+        self.cell_size = cell_size
+        '''the length of the side of a cell on screen'''
+
+        self.origin: Tuple[int, int] = (0, 0)
+        '''the cell drawn in the top left corner of the window'''
+
+        self._tiles: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._drawn: BoardSnapshot | None = None
+        self._board_size: Tuple[int, int] = (0, 0)
+        self._view_size: Tuple[int, int] = (0, 0)
+
+    def set_cell_size(self, cell_size: int):
+        """
+        Change the scale the board is drawn at. Everything cached for the old scale is evicted and
+        the next :method:`draw` redraws every cell.
+
+        :param cell_size: the new length of the side of a cell on screen
+        :return: None
+        """
+
+        if cell_size == self.cell_size:
+            return
+        self.cell_size = cell_size
+        self._tiles.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Forget what is on screen so the next :method:`draw` redraws every cell, e.g. after the
+        window was resized and its contents were lost.
+
+        :return: None
+        """
+
+        self._drawn = None
+
+    def scroll(self, cells_x: int, cells_y: int) -> bool:
+        """
+        Move the viewport across the board, it stops at the edges.
+
+        :param cells_x: how many cells to move right, negative moves left
+        :param cells_y: how many cells to move down, negative moves up
+        :return: True if the viewport moved and the board needs drawing again
+        """
+
+        origin = self._clamp((self.origin[0] + cells_x, self.origin[1] + cells_y))
+        if origin == self.origin:
+            return False
+        self.origin = origin
+        self.invalidate()
+        return True
+
+    def cell_at(self, position: Tuple[int, int]) -> Tuple[int, int] | None:
+        """
+        The board cell under a point of the window.
+
+        :param position: x and y in window pixels
+        :return: the cell's indexes, or None if the point is not over the board
+        """
+
+        row = position[0] // self.cell_size + self.origin[0]
+        col = position[1] // self.cell_size + self.origin[1]
+        if 0 <= row < self._board_size[0] and 0 <= col < self._board_size[1]:
+            return row, col
+        return None
+
+    def draw(self, screen: pygame.Surface, frame: Frame):
+        """
+        Bring the screen up to date with a frame.
+
+        :param screen: the surface the board is drawn on
+        :param frame: the frame to draw
+        :return: None
+        """
+
+        snapshot = frame.snapshot
+        size = self.cell_size
+        self._board_size = (len(snapshot.rows), len(snapshot.rows[0]))
+        self._view_size = (screen.get_width() // size, screen.get_height() // size)
+        origin = self._clamp(self.origin)
+        if origin != self.origin:
+            self.origin = origin
+            self._drawn = None
+
+        first_row, first_col = self.origin
+        # one extra row and column for cells the window edge cuts through
+        last_row = min(first_row + self._view_size[0] + 1, self._board_size[0])
+        last_col = min(first_col + self._view_size[1] + 1, self._board_size[1])
+
+        drawn = self._drawn
+        if drawn is None:
+            screen.fill(SweeperColors.BOARD_BG.value)
+
+        # only rows inside the viewport are looked at, rows shared with the drawn frame are skipped
+        blits = []
+        for row in range(first_row, last_row):
+            states = snapshot.rows[row]
+            drawn_states = drawn.rows[row] if drawn is not None else None
+            if states is drawn_states:
+                continue
+            x = (row - first_row) * size
+            for col in range(first_col, last_col):
+                state = states[col]
+                if drawn_states is None or drawn_states[col] != state:
+                    blits.append((self._tile(state, frame.values[row][col]), (x, (col - first_col) * size)))
+
+        screen.blits(blits, False)
+        self._drawn = snapshot
+
+    def _clamp(self, origin: Tuple[int, int]) -> Tuple[int, int]:
+        # keep the viewport on the board, a board smaller than the window stays in the corner
+        return (max(0, min(origin[0], self._board_size[0] - self._view_size[0])),
+                max(0, min(origin[1], self._board_size[1] - self._view_size[1])))
+
+    def _tile(self, state: int, value: int) -> pygame.Surface:
+        # covered cells look the same whatever their value, so they share a tile.
+        key = (state, value) if state == board.REVEALED else (state, 0)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._tiles[key] = self._render_tile(state, value)
+        return tile
+
+    def _render_tile(self, state: int, value: int) -> pygame.Surface:
+        tile = pygame.Surface((self.cell_size, self.cell_size))
+        if state & board.FLAGGED:
+            tile.fill(SweeperColors.CELL_FLAGGED.value)
+        elif not state & board.REVEALED:
+            tile.fill(SweeperColors.CELL_NORMAL.value)
+            pygame.draw.rect(tile, SweeperColors.CELL_BORDER.value, tile.get_rect(), 1)
+        elif value == Cell.MINE:
+            tile.fill(SweeperColors.BOMB_BG.value)
+            mine_image = scaled_mine(self.cell_size)
+            tile.blit(mine_image, get_center(mine_image, tile))
+        else:
+            tile.fill(SweeperColors.CELL_CLICKED.value)
+            font = scaled_font(self.cell_size)
+            if font is not None:
+                rendered_text = font.render(f"{value}", True, SweeperColors.CELL_TEXT.value)
+                tile.blit(rendered_text, get_center(rendered_text, tile))
+        return tile
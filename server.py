@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import board
+from board import BoardSnapshot, GameBoard
+
+# ================
+# region Settings
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+MAX_CELLS = 100 * 100
+'''the largest board a client may ask for, building one takes a few tens of milliseconds'''
+
+BUILD_WORKERS = 2
+'''threads that build new boards, this also caps how many boards are being built at once'''
+
+MAX_SEED = 2 ** 63 - 1
+'''the largest seed a client may ask for, seeds are stored as SQLite integers'''
+
+# endregion
+# ================
+
+_builders = ThreadPoolExecutor(max_workers=BUILD_WORKERS, thread_name_prefix="board-builder")
+
+
+class GameSession:
+
+    def __init__(self, cells_x: int, cells_y: int, mines: int, seed: int | None = None):
+        """
+        One player's game, played on a headless :class:`board.GameBoard`.
+
+        The session remembers the snapshot it last reported to the client, so every move can be
+        answered with only the cells that changed.
+
+        :param cells_x: the number of columns on the board
+        :param cells_y: the number of rows on the board
+        :param mines: the number of mines on the board
+        :param seed: seed for placing the mines, a random one is chosen when omitted
+        """
+
+        self.board = GameBoard(cells_x, cells_y, mines, 1, seed, headless=True)
+        '''the rules and state of the game'''
+
+        self.status: str = "playing"
+        '''playing, won or lost'''
+
+        self._reported: BoardSnapshot = self.board.snapshot()
+
+    def reveal(self, row: int, col: int) -> List[list]:
+        return self._move(self.board.open_cell, row, col)
+
+    def flag(self, row: int, col: int) -> List[list]:
+        def _flag(current_cell):
+            self.board.flag_cell(current_cell)
+            return True
+        return self._move(_flag, row, col)
+
+    def chord(self, row: int, col: int) -> List[list]:
+        return self._move(self.board.chord, row, col)
+
+    def state(self) -> List[list]:
+        """every cell that differs from a fresh board, for clients that need to resynchronise"""
+
+        blank = BoardSnapshot(tuple(bytes(self.board.num_cells_x) for _ in range(self.board.num_cells_y)))
+        self._reported = self.board.snapshot()
+        return self._encode(board.changed_cells(blank, self._reported))
+
+    def _move(self, rule, row: int, col: int) -> List[list]:
+        if self.status != "playing":
+            raise ValueError(f"game is over, {self.status}")
+        if not (0 <= row < self.board.num_cells_y and 0 <= col < self.board.num_cells_x):
+            raise ValueError("cell is outside the board")
+
+        if not rule(self.board.cell_matrix[row][col]):
+            self.status = "lost"
+
+        current = self.board.snapshot()
+        changed = board.changed_cells(self._reported, current)
+        self._reported = current
+        if changed and self.status == "playing" and self.board.is_cleared():
+            self.status = "won"
+        return self._encode(changed)
+
+    def _encode(self, changed) -> List[list]:
+        # the value of a cell is only sent once it is revealed, hidden mines stay hidden.
+        matrix = self.board.cell_matrix
+        return [[row, col, state, matrix[row][col].value if state & board.REVEALED else None]
+                for row, col, state in changed]
+
+
+async def handle_request(session: GameSession | None, request: dict) -> tuple:
+    """
+    Apply a single protocol request.
+
+    New boards are built on a worker thread so the event loop keeps serving other sessions.
+    A connection handles one request at a time, so it never builds more than one board at once.
+
+    :param session: the connection's current game, None before the first ``new``
+    :param request: the decoded request line
+    :return: (the session to use from now on, the response body)
+    """
+
+    op = request.get("op")
+    if op == "new":
+        cells_x = _int_field(request, "width")
+        cells_y = _int_field(request, "height")
+        mines = _int_field(request, "mines")
+        cells = cells_x * cells_y
+        if not (0 < cells_x and 0 < cells_y and cells <= MAX_CELLS and 0 <= mines < cells):
+            raise ValueError("invalid board size or mine count")
+        seed = None
+        if request.get("seed") is not None:
+            seed = _int_field(request, "seed")
+            if not 0 <= seed <= MAX_SEED:
+                raise ValueError(f"seed must be between 0 and {MAX_SEED}")
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(_builders, GameSession, cells_x, cells_y, mines, seed)
+        return session, {"seed": session.board.seed, "status": session.status}
+
+    if session is None:
+        raise ValueError("no game, send a new request first")
+    if op == "state":
+        return session, {"changed": session.state(), "status": session.status}
+    if op in ("reveal", "flag", "chord"):
+        move = getattr(session, op)
+        changed = move(_int_field(request, "row"), _int_field(request, "col"))
+        return session, {"changed": changed, "status": session.status}
+    raise ValueError(f"unknown op {op!r}")
+
+
+def _int_field(request: dict, name: str) -> int:
+    # only JSON integers are accepted, floats such as 1e400 or strings never reach the board
+    value = request.get(name)
+    if type(value) is not int:
+        raise ValueError(f"{name} must be an integer")
+    return value
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes | None:
+    # one request line, b"" once the client has gone, None for a line over the reader's limit
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        overrun = error
+
+    # throw the oversized line away up to and including its newline, so the next line starts clean
+    while True:
+        try:
+            await reader.readexactly(overrun.consumed)
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return b""
+        except asyncio.LimitOverrunError as error:
+            overrun = error
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Serve one connection: each line is a JSON request, each response is one JSON line carrying
+    the request's ``id``.
+    """
+
+    session = None
+    try:
+        while True:
+            request = {}
+            line = await _read_line(reader)
+            if line is None:
+                response = {"id": None, "ok": False, "error": "request line too long"}
+            else:
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    session, body = await handle_request(session, request)
+                    response = {"id": request.get("id"), "ok": True, **body}
+                except Exception as error:
+                    # one bad line, e.g. JSON nested too deeply to decode, must not end the session
+                    response = {"id": request.get("id") if isinstance(request, dict) else None,
+                                "ok": False, "error": str(error) or type(error).__name__}
+            writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = HOST, port: int = PORT, unix_path: str | None = None):
+    """
+    Run the game server until cancelled.
+
+    :param host: address to listen on for TCP clients
+    :param port: port to listen on for TCP clients
+    :param unix_path: listen on this Unix socket instead of TCP
+    """
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handle_client, path=unix_path)
+    else:
+        server = await asyncio.start_server(handle_client, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bombsweeper game server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="path of a Unix socket to listen on instead of TCP")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, NamedTuple, Tuple
+
+# ================
+# region Settings
+
+BATCH_SIZE = 500
+'''the largest number of games written to disk in a single transaction'''
+
+FLUSH_INTERVAL = 0.5
+'''seconds the writer waits for more games before committing a partial batch'''
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    difficulty  INTEGER NOT NULL,
+    seed        INTEGER NOT NULL,
+    duration    REAL    NOT NULL,
+    clicks      INTEGER NOT NULL,
+    cascades    INTEGER NOT NULL,
+    won         INTEGER NOT NULL,
+    finished_at REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_best ON games (difficulty, won, duration);
+CREATE INDEX IF NOT EXISTS games_recent ON games (difficulty, finished_at);
+"""
+
+_INSERT = """
+INSERT INTO games (difficulty, seed, duration, clicks, cascades, won, finished_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# endregion
+# ================
+
+
+class GameRecord(NamedTuple):
+    """A single finished game."""
+
+    difficulty: int
+    '''the difficulty preset the game was played on, see :func:`main.get_difficulty`'''
+
+    seed: int
+    '''the seed the mines were placed with'''
+
+    duration: float
+    '''seconds from the first frame to the end of the game'''
+
+    clicks: int
+    '''number of left and right clicks on the board'''
+
+    cascades: int
+    '''number of zero cells that opened an area of the board'''
+
+    won: bool
+    '''True if every safe cell was revealed, False if a mine was hit'''
+
+    finished_at: float
+    '''unix timestamp of the end of the game'''
+
+
+class StatsStore:
+
+    def __init__(self, path: str):
+        """
+        SQLite backed record of every finished game.
+
+        Games handed to :method:`record` are queued and written by a background thread in batches,
+        so the game loop never waits on the disk. Queries read through their own connection and use
+        the indexes on ``(difficulty, won, duration)`` and ``(difficulty, finished_at)``, so they stay
+        fast with hundreds of thousands of rows.
+
+        Public Methods:
+         =============
+         - :method:`record`\\ (self, game: :class:`GameRecord`)
+         - :method:`flush`\\ (self)
+         - :method:`close`\\ (self)
+         - :method:`personal_bests`\\ (self, difficulty: :class:`int`, limit: :class:`int`)
+         - :method:`win_rates`\\ (self)
+         - :method:`rolling_average`\\ (self, difficulty: :class:`int`, window: :class:`int`)
+
+        :param path: location of the database file, ``":memory:"`` is not supported since the
+            writer and the readers use separate connections.
+        """
+
+        self.path = path
+        '''location of the database file'''
+
+        self._pending: queue.Queue[GameRecord | None] = queue.Queue()
+        self._ready = threading.Event()
+        self._reader: sqlite3.Connection | None = None
+
+        # errors raised on the writer thread, handed back to the caller by flush and the queries
+        self._setup_error: Exception | None = None
+        self._write_error: Exception | None = None
+
+        # the connection, schema and indexes are set up on the writer thread, not at startup.
+        self._writer = threading.Thread(target=self._write_loop, name="stats-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, game: GameRecord):
+        """
+        Queue a finished game to be written. Never blocks.
+
+        :param game: the game to store
+        :return: None
+        """
+
+        self._pending.put_nowait(game)
+
+    def flush(self):
+        """
+        Wait until every queued game has been committed.
+
+        :raises Exception: the error from the writer if the database could not be opened or a batch
+            failed to write
+        :return: None
+        """
+
+        self._ready.wait()
+        if self._setup_error is not None:
+            raise self._setup_error
+        self._pending.join()
+        if self._write_error is not None:
+            # each failed write is reported once
+            error, self._write_error = self._write_error, None
+            raise error
+
+    def close(self):
+        """
+        Write any queued games and stop the writer thread.
+
+        :return: None
+        """
+
+        if self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def personal_bests(self, difficulty: int, limit: int = 10) -> List[Tuple[float, int, float]]:
+        """
+        The fastest won games on a difficulty.
+
+        :param difficulty: the difficulty preset
+        :param limit: the number of games to return
+        :return: (duration, seed, finished_at) for each game, fastest first
+        """
+
+        return self._query("SELECT duration, seed, finished_at FROM games "
+                           "WHERE difficulty = ? AND won = 1 ORDER BY duration LIMIT ?",
+                           (difficulty, limit))
+
+    def win_rates(self) -> List[Tuple[int, int, float]]:
+        """
+        The share of games won for every difficulty that has been played.
+
+        :return: (difficulty, games played, win rate) for each difficulty
+        """
+
+        return self._query("SELECT difficulty, COUNT(*), AVG(won) FROM games "
+                           "GROUP BY difficulty ORDER BY difficulty")
+
+    def rolling_average(self, difficulty: int, window: int = 20) -> Tuple[float, float] | None:
+        """
+        Average duration and win rate over the most recent games on a difficulty.
+
+        :param difficulty: the difficulty preset
+        :param window: how many of the latest games to average over
+        :return: (average duration, win rate), or None if the difficulty has not been played
+        """
+
+        rows = self._query("SELECT AVG(duration), AVG(won), COUNT(*) FROM "
+                           "(SELECT duration, won FROM games WHERE difficulty = ? "
+                           "ORDER BY finished_at DESC LIMIT ?)",
+                           (difficulty, window))
+        average_duration, win_rate, played = rows[0]
+        if not played:
+            return None
+        return average_duration, win_rate
+
+    def _query(self, sql: str, params: Tuple = ()) -> list:
+        self._ready.wait()
+        if self._setup_error is not None:
+            raise self._setup_error
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path)
+        return self._reader.execute(sql, params).fetchall()
+
+    def _write_loop(self):
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+        except Exception as error:
+            # anything escaping here would leave flush and the queries waiting forever
+            self._setup_error = error
+            return
+        finally:
+            # readers wait on this, it has to be set whether or not the database opened
+            self._ready.set()
+
+        running = True
+        while running:
+            # block for the first game, then gather whatever else arrives within the flush interval.
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            if batch[-1] is None:
+                running = False
+            games = [game for game in batch if game is not None]
+            try:
+                if games:
+                    with connection:
+                        connection.executemany(_INSERT, games)
+            except Exception as error:
+                # the batch is lost, keep the writer alive for the games that follow
+                self._write_error = error
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+        connection.close()
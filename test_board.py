@@ -0,0 +1,142 @@
+import sys
+
+import pytest
+
+from board import GameBoard
+
+
+def test_zero_click_clears_board_without_mines():
+    game_board = GameBoard(30, 20, 0, 1, seed=1, headless=True)
+
+    assert game_board.open_cell(game_board.cell_matrix[0][0])
+    assert game_board.is_cleared()
+
+
+def test_zero_click_opens_whole_area():
+    game_board = GameBoard(30, 30, 60, 1, seed=3, headless=True)
+    matrix = game_board.cell_matrix
+    start = next(cell for row in matrix for cell in row if cell.value == 0)
+
+    # reference flood fill: every zero reachable from the start, plus the cells bordering them
+    expected = set()
+    pending = [start]
+    while pending:
+        current = pending.pop()
+        if current in expected:
+            continue
+        expected.add(current)
+        if current.value == 0:
+            current.get_adjacency(matrix)
+            pending.extend(current.adjacent_list)
+
+    game_board.open_cell(start)
+    revealed = {cell for row in matrix for cell in row if cell.is_revealed}
+    assert revealed == expected
+
+
+def test_revealed_cell_cannot_be_flagged():
+    game_board = GameBoard(5, 5, 0, 1, seed=1, headless=True)
+    current_cell = game_board.cell_matrix[2][2]
+    game_board.open_cell(current_cell)
+
+    game_board.flag_cell(current_cell)
+    assert not current_cell.is_flagged
+
+
+def test_undo_rewinds_cascade_count():
+    game_board = GameBoard(5, 5, 0, 1, seed=1, headless=True)
+    game_board.open_cell(game_board.cell_matrix[0][0])
+    game_board.commit_move()
+    assert game_board.cascades == 1
+
+    assert game_board.undo()
+    assert game_board.cascades == 0
+    assert game_board.redo()
+    assert game_board.cascades == 1
+
+
+def test_mine_count_matches_request():
+    for cells_x, cells_y, mines in ((5, 4, 19), (15, 15, 45), (30, 20, 0)):
+        game_board = GameBoard(cells_x, cells_y, mines, 1, seed=7, headless=True)
+        placed = sum(cell.value == -1 for row in game_board.cell_matrix for cell in row)
+        assert placed == mines
+
+
+def test_same_seed_places_same_mines():
+    first = GameBoard(15, 15, 45, 1, seed=11, headless=True)
+    second = GameBoard(15, 15, 45, 1, seed=11, headless=True)
+
+    assert ([[cell.value for cell in row] for row in first.cell_matrix]
+            == [[cell.value for cell in row] for row in second.cell_matrix])
+
+
+def test_restore_rejects_snapshot_of_other_width():
+    game_board = GameBoard(6, 5, 3, 1, seed=1, headless=True)
+    wider = GameBoard(7, 5, 3, 1, seed=1, headless=True)
+
+    with pytest.raises(ValueError):
+        game_board.restore(wider.snapshot())
+
+
+def test_move_shares_untouched_rows():
+    game_board = GameBoard(10, 10, 10, 1, seed=4, headless=True)
+    before = game_board.snapshot()
+    game_board.flag_cell(game_board.cell_matrix[3][6])
+    game_board.commit_move()
+    after = game_board.snapshot()
+
+    assert after.rows[3] is not before.rows[3]
+    assert all(after.rows[row] is before.rows[row] for row in range(10) if row != 3)
+
+
+def test_undo_and_redo_restore_cells():
+    game_board = GameBoard(10, 10, 10, 1, seed=4, headless=True)
+    matrix = game_board.cell_matrix
+    safe = next(cell for row in matrix for cell in row if cell.value > 0)
+    mine = next(cell for row in matrix for cell in row if cell.value == -1)
+    game_board.open_cell(safe)
+    game_board.commit_move()
+    game_board.flag_cell(mine)
+    game_board.commit_move()
+
+    assert game_board.undo()
+    assert safe.is_revealed and not mine.is_flagged
+    assert game_board.undo()
+    assert not safe.is_revealed and not mine.is_flagged
+    assert not game_board.undo()
+
+    assert game_board.redo()
+    assert game_board.redo()
+    assert safe.is_revealed and mine.is_flagged
+    assert not game_board.redo()
+
+
+def test_restore_can_be_undone():
+    game_board = GameBoard(10, 10, 10, 1, seed=4, headless=True)
+    matrix = game_board.cell_matrix
+    start = game_board.snapshot()
+    game_board.flag_cell(matrix[0][0])
+    game_board.commit_move()
+    game_board.flag_cell(matrix[9][9])
+    game_board.commit_move()
+
+    game_board.restore(start)
+    assert not matrix[0][0].is_flagged and not matrix[9][9].is_flagged
+
+    assert game_board.undo()
+    assert matrix[0][0].is_flagged and matrix[9][9].is_flagged
+
+
+def test_move_memory_does_not_grow_with_board():
+    game_board = GameBoard(300, 300, 100, 1, seed=6, headless=True)
+    before = game_board.snapshot()
+    game_board.flag_cell(game_board.cell_matrix[150][150])
+    game_board.commit_move()
+    after = game_board.snapshot()
+
+    # the move owns the snapshot, its tuple of rows and the one row it changed, a full copy of
+    # the board would be around 100 KB
+    new_rows = [row for row, old in zip(after.rows, before.rows) if row is not old]
+    used = sys.getsizeof(after) + sys.getsizeof(after.rows) + sum(map(sys.getsizeof, new_rows))
+    assert len(new_rows) == 1
+    assert used < 4 * 1024
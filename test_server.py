@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import board
+from server import GameSession, MAX_CELLS, handle_request
+
+
+def _find(session, predicate):
+    return next((row, col) for row, cells in enumerate(session.board.cell_matrix)
+                for col, cell in enumerate(cells) if predicate(cell))
+
+
+def test_move_returns_only_changed_cells():
+    session = GameSession(10, 10, 20, seed=5)
+    row, col = _find(session, lambda cell: cell.value > 0)
+
+    changed = session.reveal(row, col)
+    assert changed == [[row, col, board.REVEALED, session.board.cell_matrix[row][col].value]]
+
+    # nothing changes when the same cell is revealed again
+    assert session.reveal(row, col) == []
+
+
+def test_hidden_cells_carry_no_value():
+    session = GameSession(10, 10, 20, seed=5)
+    row, col = _find(session, lambda cell: cell.value == -1)
+
+    assert session.flag(row, col) == [[row, col, board.FLAGGED, None]]
+
+
+def test_state_resyncs_every_changed_cell():
+    session = GameSession(10, 10, 20, seed=5)
+    moves = (session.reveal(*_find(session, lambda cell: cell.value == 0))
+             + session.flag(*_find(session, lambda cell: cell.value == -1)))
+    reported = {(row, col): [cell_state, value] for row, col, cell_state, value in moves}
+
+    state = {(row, col): [cell_state, value] for row, col, cell_state, value in session.state()}
+    assert state == reported
+
+
+def test_game_over_blocks_moves():
+    session = GameSession(5, 5, 3, seed=2)
+    row, col = _find(session, lambda cell: cell.value == -1)
+
+    session.reveal(row, col)
+    assert session.status == "lost"
+    with pytest.raises(ValueError):
+        session.reveal(0, 0)
+
+
+def test_single_click_wins_board_without_mines():
+    session, body = asyncio.run(handle_request(None, {"op": "new", "width": 6, "height": 4, "mines": 0}))
+    assert body["status"] == "playing"
+
+    _, body = asyncio.run(handle_request(session, {"op": "reveal", "row": 0, "col": 0}))
+    assert body["status"] == "won"
+    assert len(body["changed"]) == 24
+
+
+@pytest.mark.parametrize("fields", [
+    {"width": "5", "height": 5, "mines": 1},
+    {"width": 5.0, "height": 5, "mines": 1},
+    {"width": 1e400, "height": 5, "mines": 1},
+    {"width": True, "height": 5, "mines": 1},
+    {"width": 5, "height": 5, "mines": 1, "seed": "x"},
+    {"width": 0, "height": 5, "mines": 0},
+    {"width": 5, "height": 5, "mines": 25},
+    {"width": 5, "height": 5, "mines": -1},
+    {"width": 5, "height": 5, "mines": 1, "seed": -1},
+    {"width": 5, "height": 5, "mines": 1, "seed": 2 ** 63},
+    {"width": MAX_CELLS + 1, "height": 1, "mines": 1},
+])
+def test_new_rejects_invalid_fields(fields):
+    with pytest.raises(ValueError):
+        asyncio.run(handle_request(None, {"op": "new", **fields}))
+
+
+def test_moves_need_a_game():
+    with pytest.raises(ValueError):
+        asyncio.run(handle_request(None, {"op": "reveal", "row": 0, "col": 0}))
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+import stats
+from stats import GameRecord, StatsStore
+
+
+@pytest.fixture(autouse=True)
+def short_flush_interval(monkeypatch):
+    monkeypatch.setattr(stats, "FLUSH_INTERVAL", 0.01)
+
+
+@pytest.fixture
+def store(tmp_path):
+    game_stats = StatsStore(str(tmp_path / "stats.db"))
+    yield game_stats
+    game_stats.close()
+
+
+def _game(difficulty=1, duration=60.0, won=True, finished_at=0.0, seed=1):
+    return GameRecord(difficulty, seed, duration, 10, 2, won, finished_at)
+
+
+def test_recorded_games_are_queryable(store):
+    for finished_at, (duration, won) in enumerate([(50.0, True), (30.0, True), (10.0, False), (40.0, True)]):
+        store.record(_game(duration=duration, won=won, finished_at=finished_at))
+    store.record(_game(difficulty=2, duration=90.0, won=False))
+    store.flush()
+
+    assert [best[0] for best in store.personal_bests(1, limit=2)] == [30.0, 40.0]
+    assert store.win_rates() == [(1, 4, 0.75), (2, 1, 0.0)]
+    assert store.rolling_average(1, window=2) == (25.0, 0.5)
+    assert store.rolling_average(3) is None
+
+
+def test_unopenable_path_raises(tmp_path):
+    game_stats = StatsStore(str(tmp_path / "missing" / "stats.db"))
+    game_stats.record(_game())
+
+    with pytest.raises(sqlite3.OperationalError):
+        game_stats.flush()
+    with pytest.raises(sqlite3.OperationalError):
+        game_stats.win_rates()
+    game_stats.close()
+
+
+def test_failed_batch_is_reported_once(store):
+    # SQLite integers are 64 bit, this seed cannot be written
+    store.record(_game(seed=2 ** 70))
+    with pytest.raises(OverflowError):
+        store.flush()
+    store.flush()
+
+    store.record(_game())
+    store.flush()
+    assert store.win_rates() == [(1, 1, 1.0)]